@@ -8,15 +8,16 @@ A single-run, privacy-first Secret Santa helper with encrypted backup.
 1. The organizer enters all participant names.
 2. The program randomly pairs everyone so that nobody gifts to themselves
    (this is a *derangement*).
-3. It writes the assignments to a temporary file for the duration of the run.
-4. Creates an encrypted ZIP backup in the script's directory.
-5. Each participant enters their name to privately learn their recipient
+3. Creates an encrypted ZIP backup in the script's directory. Only if the
+   backup is disabled (or fails) are the assignments written to a temporary
+   file for the duration of the run.
+4. Each participant enters their name to privately learn their recipient
    AND their portion of the encryption password.
    After each reveal, the screen and scrollback are cleared for privacy.
-6. When the session ends (or is interrupted), the temporary file is deleted.
+5. When the session ends (or is interrupted), any temporary file is deleted.
 
 Python: 3.8+
-Dependencies: pip install pyzipper
+Dependencies: pip install pyzipper (optional: orjson for faster JSON)
 """
 
 import atexit
@@ -26,18 +27,23 @@ import random
 import secrets
 import string
 import signal
+import struct
 import sys
 import tempfile
 import time
 import argparse
-from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple
+from collections import defaultdict
+from typing import DefaultDict, Dict, FrozenSet, List, Optional, Set, Tuple
 try:
     import pyzipper
 except ImportError:
     print("Error: pyzipper module not found.")
     print("Please install it with: pip install pyzipper")
     sys.exit(1)
+try:
+    import orjson  # optional: faster JSON serialization
+except ImportError:
+    orjson = None
 
 # ============ Default behavior ============
 ONE_SHOT_REVEAL_DEFAULT = True     # each person may view only once
@@ -47,16 +53,41 @@ REVEAL_TIMEOUT_SEC_DEFAULT = False  # set an integer number of seconds for auto-
 
 TMP_ASSIGN_PATH: Optional[str] = None
 
+# Directory where the script is located (backups are written here)
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Cryptographically secure RNG used for pairings unless --seed is given
+_SYSTEM_RNG = secrets.SystemRandom()
+
+# Flags for creating the backup ZIP (platform-specific flags fall back to 0)
+_BACKUP_OPEN_FLAGS = (
+    os.O_WRONLY | os.O_CREAT | os.O_EXCL
+    | getattr(os, 'O_CLOEXEC', 0)
+    | getattr(os, 'O_NOFOLLOW', 0)
+    | getattr(os, 'O_BINARY', 0)
+)
+
+# Password alphabet (a-zA-Z0-9) and a byte -> character table for unbiased sampling
+PASSWORD_ALPHABET = string.ascii_letters + string.digits
+_PASSWORD_LIMIT = 256 - 256 % len(PASSWORD_ALPHABET)  # largest multiple of 62 below 256
+_PASSWORD_TABLE = bytes.maketrans(
+    bytes(range(_PASSWORD_LIMIT)),
+    (PASSWORD_ALPHABET * (_PASSWORD_LIMIT // len(PASSWORD_ALPHABET))).encode('ascii'),
+)
+_PASSWORD_REJECT = bytes(range(_PASSWORD_LIMIT, 256))  # deleted to avoid modulo bias
+
 
 def clear_screen_and_scrollback() -> None:
     """Clear current screen AND scrollback/history."""
-    sys.stdout.write("\033[2J\033[H")  # clear visible screen & move cursor home
-    sys.stdout.write("\033[3J")        # clear scrollback
+    # clear scrollback, clear visible screen & move cursor home
+    sys.stdout.write("\033[3J\033[2J\033[H")
     sys.stdout.flush()
-    try:
-        os.system('cls' if os.name == 'nt' else 'clear')
-    except Exception:
-        pass
+    if os.name == 'nt':
+        # ANSI handling is unreliable on older Windows consoles
+        try:
+            os.system('cls')
+        except Exception:
+            pass
 
 
 def exit_cleanup() -> None:
@@ -168,14 +199,8 @@ def prompt_names() -> List[str]:
     """Prompt for comma-separated names and return a de-duplicated list."""
     print("Enter all participant names, comma-separated (at least 2):")
     raw = input("> ").strip()
-    names = [n.strip() for n in raw.split(",") if n.strip()]
-
-    seen = set()
-    uniq: List[str] = []
-    for n in names:
-        if n not in seen:
-            seen.add(n)
-            uniq.append(n)
+    names = [s for n in raw.split(",") if (s := n.strip())]
+    uniq: List[str] = list(dict.fromkeys(names))  # order-preserving de-dup
 
     if len(uniq) < 2:
         print("Need at least 2 distinct names. Exiting.")
@@ -183,30 +208,66 @@ def prompt_names() -> List[str]:
     return uniq
 
 
-def gen_derangement(names: List[str]) -> Dict[str, str]:
-    """Generate a derangement (no one gifts to themselves) by shuffle-and-check."""
-    givers = names[:]
-    receivers = names[:]
+def gen_derangement(names: List[str], rng: Optional[random.Random] = None) -> Dict[str, str]:
+    """Generate a derangement (no one gifts to themselves) by early-reject Fisher-Yates.
+
+    Uses the OS CSPRNG unless a seeded ``rng`` is supplied for reproducible runs.
+    """
+    n = len(names)
+    randrange = (rng or _SYSTEM_RNG).randrange
     while True:
-        random.shuffle(receivers)
-        if all(g != r for g, r in zip(givers, receivers)):
-            return dict(zip(givers, receivers))
+        perm = list(range(n))
+        for i in reversed(range(1, n)):
+            j = randrange(i + 1)
+            if perm[j] == i:
+                break  # position i would be fixed; restart
+            perm[i], perm[j] = perm[j], perm[i]
+        else:
+            if perm[0] != 0:
+                return {names[i]: names[perm[i]] for i in range(n)}
 
 
 def generate_secure_password(length: int) -> str:
-    """Generate a secure random password with digits, uppercase and lowercase letters."""
-    characters = string.ascii_letters + string.digits  # a-zA-Z0-9
-    return ''.join(secrets.choice(characters) for _ in range(length))
+    """Generate a secure random password with digits, uppercase and lowercase letters.
+
+    Draws one batch of os.urandom bytes per round and rejection-samples them
+    onto the alphabet, instead of one secrets.choice call per character.
+    """
+    chars = bytearray()
+    while len(chars) < length:
+        buf = os.urandom(length * 2)
+        chars += buf.translate(_PASSWORD_TABLE, _PASSWORD_REJECT)
+    return chars[:length].decode('ascii')
 
 
 def split_password_into_parts(password: str, num_parts: int) -> List[str]:
-    """Split password into N equal parts (each 4 digits)."""
-    part_length = len(password) // num_parts
-    return [password[i:i + part_length] for i in range(0, len(password), part_length)]
+    """Split password into N equal parts (each 4 characters)."""
+    assert len(password) == 4 * num_parts
+    return [p.decode('ascii') for p in struct.unpack('4s' * num_parts, password.encode('ascii'))]
+
+
+def format_assignments_text(assignments: Dict[str, str]) -> bytes:
+    """Render the assignments as the UTF-8 text stored in the backup ZIP."""
+    return (
+        "Secret Santa Assignments\n" + "=" * 50 + "\n\n"
+        + "\n".join(f"{giver} -> {receiver}" for giver, receiver in sorted(assignments.items()))
+        + "\n"
+    ).encode('utf-8')
 
 
-def create_encrypted_backup(assignments: Dict[str, str], num_participants: int) -> Tuple[str, str]:
+def dump_assignments_json(assignments: Dict[str, str]) -> bytes:
+    """Serialize the assignments to UTF-8 JSON (uses orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(assignments)
+    return json.dumps(assignments, ensure_ascii=False).encode('utf-8')
+
+
+def create_encrypted_backup(body: bytes, num_participants: int) -> Tuple[str, str]:
     """Create an encrypted ZIP file containing the assignments in the script's directory.
+
+    ``body`` is the pre-rendered text from format_assignments_text().
+
+    The plaintext is built in memory and never written to disk.
     
     Returns:
         tuple: (zip_file_path, password)
@@ -215,57 +276,56 @@ def create_encrypted_backup(assignments: Dict[str, str], num_participants: int)
     password_length = 4 * num_participants
     password = generate_secure_password(password_length)
     
-    # Get the directory where the script is located
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
     # Create a timestamp for unique filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Create txt file with assignments (temporary)
-    txt_fd, txt_path = tempfile.mkstemp(prefix="secret_santa_", suffix=".txt")
-    try:
-        with os.fdopen(txt_fd, 'w', encoding='utf-8') as f:
-            f.write("Secret Santa Assignments\n")
-            f.write("=" * 50 + "\n\n")
-            for giver, receiver in sorted(assignments.items()):
-                f.write(f"{giver} -> {receiver}\n")
-        
-        # Create encrypted ZIP file in the script's directory
-        zip_filename = f"secret_santa_{timestamp}.zip"
-        zip_path = os.path.join(script_dir, zip_filename)
-        
-        with pyzipper.AESZipFile(
-            zip_path,
-            'w',
-            compression=pyzipper.ZIP_LZMA,
-            encryption=pyzipper.WZ_AES
-        ) as zf:
-            zf.setpassword(password.encode('utf-8'))
-            # Add the txt file to zip with just the basename
-            zf.write(txt_path, os.path.basename(txt_path))
-        
-        return zip_path, password
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.localtime())
     
-    finally:
-        # Clean up the temporary txt file
+    # Create encrypted ZIP file in the script's directory
+    zip_base = os.path.join(_SCRIPT_DIR, f"secret_santa_{timestamp}")
+    zip_path = zip_base + ".zip"
+
+    # Create the file owner-only and refuse to follow symlinks or overwrite;
+    # add a numeric suffix if a backup with this timestamp already exists
+    attempt = 1
+    while True:
         try:
-            os.remove(txt_path)
-        except Exception:
-            pass
+            fd = os.open(zip_path, _BACKUP_OPEN_FLAGS, 0o600)
+            break
+        except FileExistsError:
+            attempt += 1
+            zip_path = f"{zip_base}_{attempt}.zip"
+    try:
+        f = os.fdopen(fd, 'wb')
+    except Exception:
+        os.close(fd)
+        raise
+
+    with f, pyzipper.AESZipFile(
+        f,
+        'w',
+        compression=pyzipper.ZIP_STORED,
+        encryption=pyzipper.WZ_AES
+    ) as zf:
+        zf.setpassword(password.encode('utf-8'))
+        zf.writestr("assignments.txt", body)
 
+    return zip_path, password
 
-def write_tmp_assign(assignments: Dict[str, str]) -> None:
-    """Write assignments to a secure temp file (auto-deleted on exit)."""
+
+def write_tmp_assign(body: bytes) -> None:
+    """Write serialized assignments to a secure temp file (auto-deleted on exit)."""
     global TMP_ASSIGN_PATH
     fd, path = tempfile.mkstemp(prefix="secret_santa_", suffix=".json")
-    os.close(fd)
-    try:
-        os.chmod(path, 0o600)
-    except Exception:
-        pass
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(assignments, f, ensure_ascii=False, indent=2)
     TMP_ASSIGN_PATH = path
+    try:
+        try:
+            os.fchmod(fd, 0o600)  # on the fd, not the path: no TOCTOU window
+        except (AttributeError, OSError):
+            pass  # os.fchmod is unavailable on some platforms
+        view = memoryview(body)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def wait_then_clear(needs_enter: bool, timeout_sec: Optional[int]) -> None:
@@ -304,7 +364,7 @@ def build_arg_parser() -> argparse.ArgumentParser:
         "--seed",
         type=int,
         default=None,
-        help="Set PRNG seed for reproducible assignments (optional).",
+        help="Set PRNG seed for reproducible (not cryptographically secure) assignments (optional).",
     )
     parser.add_argument(
         "--no-backup",
@@ -348,19 +408,17 @@ def main() -> None:
 
     one_shot_reveal = not args.allow_repeat
 
-    # Set random seed if specified
-    if args.seed is not None:
-        random.seed(args.seed)
+    # Use a seeded PRNG only if requested; otherwise pair with the OS CSPRNG
+    rng = random.Random(args.seed) if args.seed is not None else None
 
     clear_screen_and_scrollback()
     print("Secret Santa Trustee")
     install_signal_handlers()
-    atexit.register(exit_cleanup)
 
     # Get participant names and generate assignments
     names = prompt_names()
-    assignments = gen_derangement(names)
-    write_tmp_assign(assignments)
+    name_to_index = {name: i for i, name in enumerate(names)}
+    assignments = gen_derangement(names, rng)
 
     # Create encrypted backup if enabled
     password_parts: List[str] = []
@@ -368,7 +426,9 @@ def main() -> None:
     
     if not no_backup:
         try:
-            zip_path, full_password = create_encrypted_backup(assignments, len(names))
+            zip_path, full_password = create_encrypted_backup(
+                format_assignments_text(assignments), len(names)
+            )
             password_parts = split_password_into_parts(full_password, len(names))
             print(f"\nEncrypted backup created: {os.path.basename(zip_path)}")
             print(f"Location: {os.path.dirname(zip_path)}")
@@ -377,58 +437,77 @@ def main() -> None:
             print(f"\nWarning: Failed to create encrypted backup: {e}")
             time.sleep(2)
 
+    # Keep a temporary recovery copy only when there is no encrypted backup
+    if zip_path is None:
+        atexit.register(exit_cleanup)
+        write_tmp_assign(dump_assignments_json(assignments))
+
     # Build case-insensitive lookup that preserves duplicates differing only by case
-    lc_to_names: Dict[str, List[str]] = {}
+    lc_to_names: DefaultDict[str, List[str]] = defaultdict(list)
     for original in names:
-        lc_to_names.setdefault(original.lower(), []).append(original)
+        lc_to_names[original.lower()].append(original)
+    lc_to_set: Dict[str, FrozenSet[str]] = {k: frozenset(v) for k, v in lc_to_names.items()}
     viewed: Set[str] = set()
 
     # Start private reveal mode
     clear_screen_and_scrollback()
     print("Assignments generated. Private reveal mode started.")
     print("Type your NAME to see whom you gift to (case-insensitive).")
-    print("Type 'exit' or 'quit' to end (temporary file will be deleted).")
+    if TMP_ASSIGN_PATH:
+        print("Type 'exit' or 'quit' to end (temporary file will be deleted).")
+    else:
+        print("Type 'exit' or 'quit' to end.")
+
+    # Bind globals/builtins used in the reveal loop to locals
+    _input = input
+    _print = print
+    _clear = clear_screen_and_scrollback
+    _wait_then_clear = wait_then_clear
 
     while True:
         try:
-            query = input("\nEnter your name: ").strip()
+            query = _input("\nEnter your name: ").strip()
             if not query:
-                print("Please enter a non-empty name.")
+                _print("Please enter a non-empty name.")
                 continue
             if query.lower() in ("exit", "quit"):
-                print("Exiting. Temporary file cleaned up. Happy holidays!")
+                if TMP_ASSIGN_PATH:
+                    _print("Exiting. Temporary file cleaned up. Happy holidays!")
+                else:
+                    _print("Exiting. Happy holidays!")
                 return
 
             key = query.lower()
             if key not in lc_to_names:
-                print("Name not found. Please re-check spelling and try again.")
+                _print("Name not found. Please re-check spelling and try again.")
                 continue
 
             candidates = lc_to_names[key]
+            candidate_set = lc_to_set[key]
             real_name: Optional[str] = None
 
             # Handle exact match or single candidate
-            if query in candidates:
+            if query in candidate_set:
                 real_name = query
             elif len(candidates) == 1:
                 real_name = candidates[0]
             else:
                 # Multiple matches - ask for clarification
-                print("Multiple participants match that entry:")
+                _print("Multiple participants match that entry:")
                 for idx, candidate in enumerate(candidates, start=1):
-                    print(f"  {idx}. {candidate}")
+                    _print(f"  {idx}. {candidate}")
 
                 while True:
-                    selection = input(
+                    selection = _input(
                         "Enter the number or exact name (or type 'cancel' to abort): "
                     ).strip()
 
                     if not selection:
-                        print("Please enter a selection.")
+                        _print("Please enter a selection.")
                         continue
 
                     if selection.lower() in {"cancel", "abort", "back"}:
-                        print("Selection canceled. Returning to main prompt.")
+                        _print("Selection canceled. Returning to main prompt.")
                         break
 
                     if selection.isdigit():
@@ -436,50 +515,59 @@ def main() -> None:
                         if 1 <= idx <= len(candidates):
                             real_name = candidates[idx - 1]
                             break
-                        print("Number out of range. Try again.")
+                        _print("Number out of range. Try again.")
                         continue
 
-                    if selection in candidates:
+                    if selection in candidate_set:
                         real_name = selection
                         break
 
-                    print("Input did not match any option. Try again.")
+                    _print("Input did not match any option. Try again.")
 
                 if real_name is None:
                     continue
 
             # Check if already viewed (one-shot mode)
             if one_shot_reveal and real_name in viewed:
-                print("You have already viewed your assignment.")
+                _print("You have already viewed your assignment.")
                 continue
 
             recipient = assignments[real_name]
+            lines = [
+                f"*** ONLY FOR {real_name} ***",
+                "",
+                f"You will gift to: {recipient}",
+            ]
 
-            # Display assignment
-            clear_screen_and_scrollback()
-            print(f"*** ONLY FOR {real_name} ***")
-            print(f"\nYou will gift to: {recipient}")
-            
             # Show password part if backup was created
             if password_parts and zip_path:
                 # Find this person's position in the original names list
-                person_index = names.index(real_name)
+                person_index = name_to_index[real_name]
                 password_part = password_parts[person_index]
-                print(f"\n{'='*50}")
-                print("YOUR PART OF THE ENCRYPTION PASSWORD:")
-                print(f"[Part {person_index + 1}] {password_part}")
-                print(f"{'='*50}")
-                print("\n📝 Save this password part securely!")
-                print("All participants must combine their parts (in order)")
-                print(f"to unlock: {os.path.basename(zip_path)}")
-            
+                lines += [
+                    "",
+                    "=" * 50,
+                    "YOUR PART OF THE ENCRYPTION PASSWORD:",
+                    f"[Part {person_index + 1}] {password_part}",
+                    "=" * 50,
+                    "",
+                    "📝 Save this password part securely!",
+                    "All participants must combine their parts (in order)",
+                    f"to unlock: {os.path.basename(zip_path)}",
+                ]
+
+            # Display assignment in a single write
+            _clear()
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+
             viewed.add(real_name)
 
             # Wait and clear screen
-            wait_then_clear(reveal_needs_enter, reveal_timeout_sec)
+            _wait_then_clear(reveal_needs_enter, reveal_timeout_sec)
 
         except EOFError:
-            print("\nEOF received. Exiting.")
+            _print("\nEOF received. Exiting.")
             return
 
 